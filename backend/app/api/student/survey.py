@@ -1,57 +1,161 @@
+import asyncio
+import logging
+import time
+import msgspec
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from typing import List, Dict, Any, Optional, Tuple, FrozenSet
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy import Uuid, bindparam, insert, select, text, func
 from sqlalchemy.exc import ProgrammingError
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User
-from app.models.survey import Survey as SurveyModel, Question as QuestionModel, SurveyResponse as SurveyResponseModel
+from app.models.survey import (
+    Survey as SurveyModel,
+    Question as QuestionModel,
+    SurveyResponse as SurveyResponseModel,
+    normalize_choice,
+)
 from app.utils.auth import get_current_user
+from app.utils.responses import PydanticResponse, msgspec_json_schema
 
-router = APIRouter()
+# 使用 orjson 序列化响应
+router = APIRouter(default_response_class=ORJSONResponse)
+logger = logging.getLogger(__name__)
 
-# Pydantic响应模型定义
-class QuestionResponse(BaseModel):
+# 响应结构定义（msgspec Struct：仅用于序列化，编码速度远快于 Pydantic）
+class QuestionResponse(msgspec.Struct, kw_only=True):
     id: str
     text: str
     type: str
     options: List[str] | None = None
     required: bool = True
 
-class SurveyResponse(BaseModel):
+class SurveyResponse(msgspec.Struct, kw_only=True):
     id: str
     title: str
     description: str | None = None
     status: str
     questions: List[QuestionResponse]
 
+# 请求模型定义
+
 class SurveySubmission(BaseModel):
     answers: Dict[str, Any]
 
 
-def _get_student_class_ids(db: Session, student_id: str) -> List[str]:
-    """获取学生已加入的班级ID列表"""
+# 自动判分：每个判分函数返回 (is_correct, score, teacher_comment)
+def _graded(question: QuestionModel, is_correct: bool) -> Tuple[bool, float, None]:
+    return is_correct, (float(question.score) if is_correct else 0), None
+
+
+def _grade_single_choice(question: QuestionModel, ans: Any, survey: SurveyModel) -> Tuple[bool, float, None]:
+    """单选题、判断题"""
+    correct_answer = question.normalized_correct
+    if not correct_answer:
+        return False, 0, None
+    if isinstance(correct_answer, tuple):
+        return _graded(question, ans in correct_answer)
+    return _graded(question, normalize_choice(ans) == correct_answer)
+
+
+def _grade_multiple_choice(question: QuestionModel, ans: Any, survey: SurveyModel) -> Tuple[bool, float, None]:
+    """多选题"""
+    correct_answer = question.normalized_correct
+    if not correct_answer or not isinstance(ans, list):
+        return False, 0, None
+    if isinstance(correct_answer, frozenset):
+        return _graded(question, frozenset(map(normalize_choice, ans)) == correct_answer)
+    return _graded(question, ans == correct_answer)
+
+
+def _grade_text(question: QuestionModel, ans: Any, survey: SurveyModel) -> Tuple[bool, float, None]:
+    """文本题、填空题：与标准答案精确比对"""
+    correct_answer = question.normalized_correct
+    if not correct_answer:
+        return False, 0, None
+    student_answer = str(ans).strip() if ans else ""
+    if isinstance(correct_answer, frozenset):
+        return _graded(question, student_answer in correct_answer)
+    return _graded(question, student_answer == correct_answer)
+
+
+def _grade_essay(question: QuestionModel, ans: Any, survey: SurveyModel) -> Tuple[bool, float, None]:
+    """问答题：问卷按文本比对；考试由 AI 并发打分，不经过此函数"""
+    if survey.survey_type == 'questionnaire':
+        return _grade_text(question, ans, survey)
+    return False, 0, None
+
+
+GRADERS = {
+    'single_choice': _grade_single_choice,
+    'judgment': _grade_single_choice,
+    'multiple_choice': _grade_multiple_choice,
+    'text': _grade_text,
+    'fill_blank': _grade_text,
+    'essay': _grade_essay,
+}
+
+
+def _student_uuid(current_user: User) -> UUID:
+    """当前用户ID转为 UUID（token 中解析出的是字符串）"""
+    return current_user.id if isinstance(current_user.id, UUID) else UUID(str(current_user.id))
+
+
+# 查询学生所在班级的语句：模块级构建一次，复用同一对象以命中 SQLAlchemy 编译缓存
+# （asyncpg 也会按 SQL 文本缓存预编译语句）
+_CLASS_IDS_STMT = text("""
+    SELECT class_id FROM class_students
+    WHERE student_id = :student_id AND status = 'active'
+""").bindparams(bindparam("student_id", type_=Uuid(as_uuid=False)))
+
+# 学生班级ID短时缓存：student_id -> (过期时间, 班级ID集合)
+_CLASS_IDS_CACHE_TTL = 30  # 秒
+_CLASS_IDS_CACHE_MAXSIZE = 10_000
+_class_ids_cache: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+
+
+def invalidate_student_class_ids(student_id: str | None = None) -> None:
+    """清除学生班级ID缓存（加入/退出班级后调用）；不传 student_id 时清空全部"""
+    if student_id is None:
+        _class_ids_cache.clear()
+    else:
+        _class_ids_cache.pop(str(student_id), None)
+
+
+async def _get_student_class_ids(db: AsyncSession, student_id: str) -> FrozenSet[str]:
+    """获取学生已加入的班级ID集合（带短时缓存），便于 O(1) 判断可见性"""
+    key = str(student_id)
+    now = time.monotonic()
+    cached = _class_ids_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
     try:
-        rows = db.execute(
-            text("""
-                SELECT class_id FROM class_students
-                WHERE student_id = :student_id AND status = 'active'
-            """),
-            {"student_id": str(student_id)}
-        ).fetchall()
-        return [str(r.class_id) for r in rows] if rows else []
+        result = await db.execute(_CLASS_IDS_STMT, {"student_id": key})
+        rows = result.fetchall()
+        class_ids = frozenset(str(r.class_id) for r in rows)
     except Exception as e:
-        print(f"学生班级查询失败 student_id={student_id}: {e}")
-        return []
+        logger.warning("学生班级查询失败 student_id=%s: %s", student_id, e)
+        return frozenset()
+    if len(_class_ids_cache) >= _CLASS_IDS_CACHE_MAXSIZE:
+        # 容量已满时先淘汰过期项，仍然不足则整体清空
+        for k in [k for k, (expires, _) in _class_ids_cache.items() if expires <= now]:
+            del _class_ids_cache[k]
+        if len(_class_ids_cache) >= _CLASS_IDS_CACHE_MAXSIZE:
+            _class_ids_cache.clear()
+    _class_ids_cache[key] = (now + _CLASS_IDS_CACHE_TTL, class_ids)
+    return class_ids
 
 
 @router.get("")
 async def get_surveys(
     release_type: Optional[str] = Query(None, description="发布类型: in_class=课堂检测, homework=课后作业, practice=自主练习"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取学生可用的已发布问卷列表。
@@ -61,38 +165,49 @@ async def get_surveys(
         if getattr(current_user, "role", None) != "student":
             raise HTTPException(status_code=403, detail="只有学生可以访问此接口")
         student_id = str(current_user.id)
-        class_ids = _get_student_class_ids(db, student_id)
+        class_ids = await _get_student_class_ids(db, student_id)
         if not class_ids:
             return []
         # 兼容：若表尚无 release_type/target_class_ids 列（未执行迁移），避免 500，返回空列表
         surveys = []
         try:
-            query = db.query(SurveyModel).filter(SurveyModel.status == "published")
+            stmt = select(SurveyModel).where(SurveyModel.status == "published")
             if release_type:
-                query = query.filter(SurveyModel.release_type == release_type)
-            surveys = query.order_by(SurveyModel.published_at.desc()).all()
+                stmt = stmt.where(SurveyModel.release_type == release_type)
+            survey_result = await db.execute(stmt.order_by(SurveyModel.published_at.desc()))
+            surveys = survey_result.scalars().all()
         except (ProgrammingError, Exception) as e:
-            # 打印完整异常信息用于调试
-            print(f"学生问卷列表查询异常: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
+            # 记录完整异常信息用于调试
+            logger.exception("学生问卷列表查询异常: %s: %s", type(e).__name__, e)
             err_msg = str(e).lower()
             if "release_type" in err_msg or "target_class_ids" in err_msg or "column" in err_msg:
-                print("学生问卷列表: 检测到表结构未迁移(release_type/target_class_ids)，请执行 backend/database/migrate_survey_release.sql")
+                logger.warning("学生问卷列表: 检测到表结构未迁移(release_type/target_class_ids)，请执行 backend/database/migrate_survey_release.sql")
                 return []
             raise
-        result = []
+        visible_surveys = []
         for survey in surveys:
             target_ids = getattr(survey, "target_class_ids", None) or []
             legacy_class_id = getattr(survey, "class_id", None)
             visible = False
             if target_ids:
-                visible = any(str(cid) in class_ids for cid in (target_ids if isinstance(target_ids, list) else []))
+                visible = isinstance(target_ids, list) and not class_ids.isdisjoint(map(str, target_ids))
             elif legacy_class_id:
                 visible = str(legacy_class_id) in class_ids
-            if not visible:
-                continue
-            question_count = db.query(QuestionModel).filter(QuestionModel.survey_id == survey.id).count()
+            if visible:
+                visible_surveys.append(survey)
+        # 使用 GROUP BY 一次性统计各问卷题目数，避免逐个问卷 COUNT（N+1）
+        counts = {}
+        if visible_surveys:
+            survey_ids = [s.id for s in visible_surveys]
+            count_result = await db.execute(
+                select(QuestionModel.survey_id, func.count(QuestionModel.id))
+                .where(QuestionModel.survey_id.in_(survey_ids))
+                .group_by(QuestionModel.survey_id)
+            )
+            counts = dict(count_result.all())
+        result = []
+        for survey in visible_surveys:
+            question_count = counts.get(survey.id, 0)
             end_time = getattr(survey, "end_time", None)
             result.append({
                 "id": str(survey.id),
@@ -108,35 +223,45 @@ async def get_surveys(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"学生问卷列表异常: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("学生问卷列表异常: %s", e)
         raise HTTPException(status_code=500, detail=f"获取问卷列表失败: {str(e)}")
 
 
-@router.get("/{survey_id}", response_model=SurveyResponse)
+# response_model=None：数据已由ORM整理好，跳过FastAPI的响应校验；
+# 通过 responses 声明 JSON Schema，仅用于生成 OpenAPI 文档
+@router.get(
+    "/{survey_id}",
+    response_model=None,
+    responses={200: {"content": {"application/json": {"schema": msgspec_json_schema(SurveyResponse)}}}},
+)
 async def get_survey_detail(
     survey_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取问卷详情（仅已发布且对当前学生可见的问卷）
     """
     if getattr(current_user, "role", None) != "student":
         raise HTTPException(status_code=403, detail="只有学生可以访问此接口")
-    survey = db.query(SurveyModel).filter(SurveyModel.id == survey_id).first()
+    # 预加载题目（selectinload），同时禁止其他关系的隐式懒加载
+    result = await db.execute(
+        select(SurveyModel)
+        .options(selectinload(SurveyModel.questions), raiseload("*"))
+        .where(SurveyModel.id == survey_id)
+    )
+    survey = result.scalars().first()
     if not survey or survey.status != "published":
         raise HTTPException(status_code=404, detail="问卷不存在或未发布")
-    class_ids = _get_student_class_ids(db, str(current_user.id))
+    class_ids = await _get_student_class_ids(db, str(current_user.id))
     target_ids = getattr(survey, "target_class_ids", None) or []
     legacy_class_id = getattr(survey, "class_id", None)
-    visible = (target_ids and any(cid in class_ids for cid in (target_ids if isinstance(target_ids, list) else []))) or (
+    visible = (isinstance(target_ids, list) and not class_ids.isdisjoint(map(str, target_ids))) or (
         legacy_class_id and str(legacy_class_id) in class_ids
     )
     if not visible:
         raise HTTPException(status_code=404, detail="问卷不存在或未发布")
-    questions = db.query(QuestionModel).filter(QuestionModel.survey_id == survey_id).order_by(QuestionModel.question_order).all()
+    questions = survey.questions
     
     def normalize_options(options):
         if not options:
@@ -153,21 +278,25 @@ async def get_survey_detail(
             return normalized
         return options
     
-    return SurveyResponse(
-        id=str(survey.id),
-        title=survey.title,
-        description=survey.description or "",
-        status=survey.status,
-        questions=[
-            QuestionResponse(
-                id=str(q.id),
-                text=q.question_text,
-                type=q.question_type,
-                options=normalize_options(q.options),
-                required=q.is_required,
-            )
-            for q in questions
-        ]
+    # 题目较多时响应体较大，序列化放到线程池中完成
+    return await PydanticResponse.create(
+        content=SurveyResponse(
+            id=str(survey.id),
+            title=survey.title,
+            description=survey.description or "",
+            status=survey.status,
+            questions=[
+                QuestionResponse(
+                    id=str(q.id),
+                    text=q.question_text,
+                    type=q.question_type,
+                    options=normalize_options(q.options),
+                    required=q.is_required,
+                )
+                for q in questions
+            ]
+        ),
+        status_code=200,
     )
 
 
@@ -175,7 +304,7 @@ async def get_survey_detail(
 async def get_my_result(
     survey_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     获取当前学生在该问卷下的作答状态与成绩。
@@ -183,30 +312,28 @@ async def get_my_result(
     """
     if getattr(current_user, "role", None) != "student":
         raise HTTPException(status_code=403, detail="只有学生可以访问此接口")
-    from uuid import UUID
     from app.models.survey import Answer as AnswerModel
-    try:
-        sid = current_user.id if hasattr(current_user.id, 'hex') else UUID(str(current_user.id))
-    except Exception:
-        sid = UUID(str(current_user.id))
-    response = (
-        db.query(SurveyResponseModel)
-        .filter(
+    sid = _student_uuid(current_user)
+    result = await db.execute(
+        select(SurveyResponseModel)
+        .where(
             SurveyResponseModel.survey_id == survey_id,
             SurveyResponseModel.student_id == sid,
         )
         .order_by(SurveyResponseModel.attempt_number.desc())
-        .first()
+        .limit(1)
     )
+    response = result.scalars().first()
     if not response:
         return {"submitted": False}
     submitted = response.submit_time is not None
     score_published = response.total_score is not None
     
     # 获取详细答案和AI打分结果
-    answers = db.query(AnswerModel).filter(
-        AnswerModel.response_id == response.id
-    ).all()
+    result = await db.execute(
+        select(AnswerModel).where(AnswerModel.response_id == response.id)
+    )
+    answers = result.scalars().all()
     
     detailed_answers = []
     for ans in answers:
@@ -217,14 +344,9 @@ async def get_my_result(
             "score": float(ans.score) if ans.score is not None else None,
         }
         
-        # 如果有AI打分结果，解析teacher_comment
-        if ans.teacher_comment:
-            try:
-                import json
-                grading_result = json.loads(ans.teacher_comment)
-                answer_data["gradingResult"] = grading_result
-            except:
-                pass
+        # AI打分结果以 JSONB 存储，直接返回无需再解析
+        if ans.grading_result:
+            answer_data["gradingResult"] = ans.grading_result
         
         detailed_answers.append(answer_data)
     
@@ -244,85 +366,82 @@ async def submit_survey(
     survey_id: str,
     submission: SurveySubmission,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     提交问卷答案。会写入 survey_responses 与 answers；若已有提交记录则更新或按 attempt 追加。
     """
-    print(f"=" * 70)
-    print(f"📝 学生提交问卷 - 开始")
-    print(f"问卷ID: {survey_id}")
-    print(f"学生ID: {current_user.id}")
-    print(f"学生角色: {getattr(current_user, 'role', None)}")
-    print(f"提交答案数量: {len(submission.answers) if submission.answers else 0}")
-    print(f"=" * 70)
+    logger.debug(
+        "📝 学生提交问卷 - 开始: survey_id=%s, student_id=%s, role=%s, 答案数量=%d",
+        survey_id, current_user.id, getattr(current_user, "role", None), len(submission.answers or {}),
+    )
     
     if getattr(current_user, "role", None) != "student":
-        print(f"❌ 权限验证失败：用户角色不是学生")
+        logger.debug("❌ 权限验证失败：用户角色不是学生")
         raise HTTPException(status_code=403, detail="只有学生可以访问此接口")
     
-    print(f"✅ 权限验证通过")
+    logger.debug("✅ 权限验证通过")
     
-    survey = db.query(SurveyModel).filter(SurveyModel.id == survey_id).first()
+    result = await db.execute(select(SurveyModel).where(SurveyModel.id == survey_id))
+    survey = result.scalars().first()
     if not survey or survey.status != "published":
-        print(f"❌ 问卷验证失败：问卷不存在或未发布")
+        logger.debug("❌ 问卷验证失败：问卷不存在或未发布")
         raise HTTPException(status_code=404, detail="问卷不存在或未发布")
     
-    print(f"✅ 问卷验证通过: {survey.title}")
+    logger.debug("✅ 问卷验证通过: %s", survey.title)
     
-    class_ids = _get_student_class_ids(db, str(current_user.id))
-    print(f"📚 学生所在班级: {class_ids}")
+    class_ids = await _get_student_class_ids(db, str(current_user.id))
+    logger.debug("📚 学生所在班级: %s", class_ids)
     
     target_ids = getattr(survey, "target_class_ids", None) or []
     legacy_class_id = getattr(survey, "class_id", None)
-    visible = (target_ids and any(str(cid) in class_ids for cid in (target_ids if isinstance(target_ids, list) else []))) or (
+    visible = (isinstance(target_ids, list) and not class_ids.isdisjoint(map(str, target_ids))) or (
         legacy_class_id and str(legacy_class_id) in class_ids
     )
     if not visible:
-        print(f"❌ 班级权限验证失败：学生不在目标班级中")
+        logger.debug("❌ 班级权限验证失败：学生不在目标班级中")
         raise HTTPException(status_code=404, detail="问卷不存在或未发布")
     
-    print(f"✅ 班级权限验证通过")
+    logger.debug("✅ 班级权限验证通过")
     
     from datetime import datetime
-    from uuid import UUID
-    try:
-        sid = current_user.id if hasattr(current_user.id, 'hex') else UUID(str(current_user.id))
-    except Exception:
-        sid = UUID(str(current_user.id))
+    sid = _student_uuid(current_user)
     
-    existing = (
-        db.query(SurveyResponseModel)
-        .filter(
+    result = await db.execute(
+        select(SurveyResponseModel)
+        .where(
             SurveyResponseModel.survey_id == survey_id,
             SurveyResponseModel.student_id == sid,
         )
         .order_by(SurveyResponseModel.attempt_number.desc())
-        .first()
+        .limit(1)
     )
+    existing = result.scalars().first()
     
-    print(f"📊 已有提交记录: {'是' if existing else '否'}")
+    logger.debug("📊 已有提交记录: %s", "是" if existing else "否")
     
     if not survey.allow_multiple_attempts:
         if existing:
-            print(f"❌ 多次提交检查失败：不允许多次作答")
+            logger.debug("❌ 多次提交检查失败：不允许多次作答")
             raise HTTPException(
                 status_code=400,
                 detail="该问卷不允许多次作答，您已经提交过了"
             )
     else:
-        existing_attempts = db.query(SurveyResponseModel).filter(
-            SurveyResponseModel.survey_id == survey_id,
-            SurveyResponseModel.student_id == sid,
-        ).count()
+        existing_attempts = await db.scalar(
+            select(func.count(SurveyResponseModel.id)).where(
+                SurveyResponseModel.survey_id == survey_id,
+                SurveyResponseModel.student_id == sid,
+            )
+        )
         if existing_attempts >= survey.max_attempts:
-            print(f"❌ 多次提交检查失败：已达到最大作答次数")
+            logger.debug("❌ 多次提交检查失败：已达到最大作答次数")
             raise HTTPException(
                 status_code=400,
                 detail=f"您已达到最大作答次数（{survey.max_attempts}次）"
             )
     
-    print(f"✅ 多次提交检查通过")
+    logger.debug("✅ 多次提交检查通过")
     
     attempt = (existing.attempt_number + 1) if existing else 1
     resp = SurveyResponseModel(
@@ -333,77 +452,55 @@ async def submit_survey(
         submit_time=datetime.utcnow(),
     )
     db.add(resp)
-    db.flush()
+    await db.flush()
     
-    print(f"✅ 创建提交记录: response_id={resp.id}, attempt_number={attempt}")
+    logger.debug("✅ 创建提交记录: response_id=%s, attempt_number=%s", resp.id, attempt)
     
     answers = submission.answers or {}
     total_score = 0
     answer_count = 0
     
     from app.services.essay_grading_service import essay_grading_service
+    from app.models.survey import Answer as AnswerModel
     
-    for qid, ans in answers.items():
-        from app.models.survey import Answer as AnswerModel
-        
-        question = db.query(QuestionModel).filter(
-            QuestionModel.id == UUID(qid)
-        ).first()
+    # 题目ID只解析一次，后续查询与写入答案都复用
+    parsed = {UUID(qid): ans for qid, ans in answers.items()}
+    # 一次性批量查询本次提交涉及的全部题目，避免逐题查询（N+1）
+    questions = {}
+    if parsed:
+        result = await db.execute(select(QuestionModel).where(QuestionModel.id.in_(list(parsed))))
+        questions = {q.id: q for q in result.scalars().all()}
+    answer_rows = []
+    graded = []  # [qid, ans, is_correct, score, teacher_comment, grading_result]
+    pending = []  # (graded 下标, question, ans)：待AI打分的问答题
+    
+    for qid, ans in parsed.items():
+        question = questions.get(qid)
         
         if not question:
-            print(f"⚠️ 题目不存在: question_id={qid}")
+            logger.warning("⚠️ 题目不存在: question_id=%s", qid)
             continue
         
         is_correct = False
         score = 0
         teacher_comment = None
+        grading_result = None
         
-        if question.question_type in ['single_choice', 'judgment']:
-            correct_answer = question.correct_answer
-            if correct_answer:
-                if isinstance(correct_answer, list):
-                    is_correct = ans in correct_answer
-                else:
-                    student_answer = str(ans).strip()
-                    correct_answer_str = str(correct_answer).strip()
-                    if '.' in student_answer:
-                        student_answer = student_answer.split('.')[0].strip()
-                    is_correct = student_answer == correct_answer_str
-                if is_correct:
-                    score = float(question.score)
-        elif question.question_type == 'multiple_choice':
-            correct_answer = question.correct_answer
-            if correct_answer and isinstance(ans, list):
-                if isinstance(correct_answer, list):
-                    student_answers = []
-                    for a in ans:
-                        a_str = str(a).strip()
-                        if '.' in a_str:
-                            a_str = a_str.split('.')[0].strip()
-                        student_answers.append(a_str)
-                    is_correct = set(student_answers) == set(correct_answer)
-                else:
-                    is_correct = ans == correct_answer
-                if is_correct:
-                    score = float(question.score)
-        elif question.question_type in ['text', 'fill_blank']:
-            correct_answer = question.correct_answer
-            if correct_answer:
-                student_answer = str(ans).strip() if ans else ""
-                
-                if isinstance(correct_answer, list):
-                    is_correct = student_answer in [str(item).strip() for item in correct_answer]
-                else:
-                    correct_answer_str = str(correct_answer).strip()
-                    is_correct = student_answer == correct_answer_str
-                
-                if is_correct:
-                    score = float(question.score)
-        elif question.question_type == 'essay' and survey.survey_type == 'exam':
-            print(f"📝 问答题AI打分: question_type={question.question_type}, survey_type={survey.survey_type}")
-            
-            try:
-                grading_result = await essay_grading_service.grade_essay(
+        if question.question_type == 'essay' and survey.survey_type == 'exam':
+            # 问答题AI打分耗时较长，先收集起来，循环结束后并发打分
+            pending.append((len(graded), question, ans))
+        else:
+            grader = GRADERS.get(question.question_type)
+            if grader:
+                is_correct, score, teacher_comment = grader(question, ans, survey)
+        
+        graded.append([qid, ans, is_correct, score, teacher_comment, grading_result])
+    
+    if pending:
+        logger.debug("📝 问答题AI打分: %d 题并发打分, survey_type=%s", len(pending), survey.survey_type)
+        results = await asyncio.gather(
+            *[
+                essay_grading_service.grade_essay(
                     question_text=question.question_text,
                     question_type=question.question_type,
                     reference_answer=question.correct_answer,
@@ -412,62 +509,59 @@ async def submit_survey(
                     student_answer=str(ans) if ans else "",
                     max_score=float(question.score)
                 )
-                
+                for _, question, ans in pending
+            ],
+            return_exceptions=True,
+        )
+        for (idx, _, _), grading_result in zip(pending, results):
+            try:
+                if isinstance(grading_result, BaseException):
+                    raise grading_result
                 score = grading_result.get('score', 0)
                 is_correct = grading_result.get('percentage', 0) >= 60
-                teacher_comment = json.dumps(grading_result, ensure_ascii=False)
-                
-                print(f"✅ AI打分完成: score={score}, is_correct={is_correct}")
-                
+                teacher_comment = None
+                logger.debug("✅ AI打分完成: score=%s, is_correct=%s", score, is_correct)
             except Exception as e:
-                print(f"❌ AI打分失败: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("❌ AI打分失败: %s", e)
                 score = 0
                 is_correct = False
                 teacher_comment = f"AI打分失败: {str(e)}"
-        elif question.question_type == 'essay' and survey.survey_type == 'questionnaire':
-            correct_answer = question.correct_answer
-            if correct_answer:
-                student_answer = str(ans).strip() if ans else ""
-                
-                if isinstance(correct_answer, list):
-                    is_correct = student_answer in [str(item).strip() for item in correct_answer]
-                else:
-                    correct_answer_str = str(correct_answer).strip()
-                    is_correct = student_answer == correct_answer_str
-                
-                if is_correct:
-                    score = float(question.score)
-        
+                grading_result = None
+            graded[idx][2:] = [is_correct, score, teacher_comment, grading_result]
+    
+    for qid, ans, is_correct, score, teacher_comment, grading_result in graded:
         total_score += score
         answer_count += 1
         
-        a = AnswerModel(
-            response_id=resp.id,
-            question_id=UUID(qid),
-            student_answer=ans,
-            is_correct=is_correct,
-            score=score,
-            teacher_comment=teacher_comment,
-            auto_graded=True,
-        )
-        db.add(a)
+        answer_rows.append({
+            "response_id": resp.id,
+            "question_id": qid,
+            "student_answer": ans,
+            "is_correct": is_correct,
+            "score": score,
+            "teacher_comment": teacher_comment,
+            "grading_result": grading_result,
+            "auto_graded": True,
+        })
     
-    print(f"✅ 保存答案记录: {answer_count} 个答案, 总分: {total_score}")
+    # 以字典批量插入答案，单条 executemany 语句完成，不经过 ORM 工作单元
+    # （answers 表无 ORM 事件监听，id/时间戳等默认值仍由列默认值生成）
+    if answer_rows:
+        await db.execute(insert(AnswerModel), answer_rows)
+    logger.debug("✅ 保存答案记录: %d 个答案, 总分: %s", answer_count, total_score)
     
     resp.total_score = total_score
     resp.percentage_score = (total_score / survey.total_score * 100) if survey.total_score > 0 else 0
     resp.is_passed = resp.percentage_score >= survey.pass_score if survey.pass_score else None
     
-    print(f"📊 计算得分: total_score={total_score}, percentage_score={resp.percentage_score}, is_passed={resp.is_passed}")
+    logger.debug(
+        "📊 计算得分: total_score=%s, percentage_score=%s, is_passed=%s",
+        total_score, resp.percentage_score, resp.is_passed,
+    )
     
-    db.commit()
+    await db.commit()
     
-    print(f"✅ 数据库提交成功")
-    print(f"=" * 70)
-    print(f"🎉 问卷提交完成")
-    print(f"=" * 70)
+    logger.debug("🎉 问卷提交完成: survey_id=%s, response_id=%s", survey_id, resp.id)
     
     return {
         "message": "问卷提交成功",
@@ -6,6 +6,8 @@ class Settings(BaseSettings):
     APP_NAME: str = "智能教学平台"
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = True
+    # 日志级别（生产环境建议 INFO，调试时可设为 DEBUG）
+    LOG_LEVEL: str = "INFO"
     
     # 服务器配置
     HOST: str = "0.0.0.0"
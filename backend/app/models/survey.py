@@ -1,10 +1,16 @@
-from sqlalchemy import Column, String, Integer, DateTime, Text, Boolean, ForeignKey, DECIMAL
+from sqlalchemy import Column, String, Integer, DateTime, Text, Boolean, ForeignKey, DECIMAL, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from functools import cached_property
 import uuid
 from app.database import Base
 
+def normalize_choice(value) -> str:
+    """规范化选择题作答：去空白并去掉选项内容，如 'A. 选项内容' -> 'A'"""
+    return str(value).strip().partition('.')[0].strip()
+
+
 class Survey(Base):
     """问卷模型"""
     __tablename__ = "surveys"
@@ -38,7 +44,12 @@ class Survey(Base):
     published_at = Column(DateTime)
 
     # 关系
-    questions = relationship("Question", back_populates="survey", cascade="all, delete-orphan")
+    questions = relationship(
+        "Question",
+        back_populates="survey",
+        cascade="all, delete-orphan",
+        order_by="Question.question_order",
+    )
 
 class Question(Base):
     """题目模型"""
@@ -67,9 +78,37 @@ class Question(Base):
     # 关系
     survey = relationship("Survey", back_populates="questions")
 
+    @cached_property
+    def normalized_correct(self):
+        """
+        预处理后的正确答案（每个对象只计算一次），用于判分时直接比较：
+        - 单选/判断题：列表原样转为 tuple，否则为去空白后的字符串
+        - 多选题：列表转为 frozenset，否则保持原值
+        - 其他题型：列表转为去空白后的字符串 frozenset，否则为去空白后的字符串
+        正确答案为空时返回 None。
+        """
+        correct = self.correct_answer
+        if not correct:
+            return None
+        if self.question_type in ('single_choice', 'judgment'):
+            return tuple(correct) if isinstance(correct, list) else str(correct).strip()
+        if self.question_type == 'multiple_choice':
+            return frozenset(correct) if isinstance(correct, list) else correct
+        if isinstance(correct, list):
+            return frozenset(str(item).strip() for item in correct)
+        return str(correct).strip()
+
 class SurveyResponse(Base):
     """问卷回答模型"""
     __tablename__ = "survey_responses"
+    __table_args__ = (
+        # 与 init.sql 中的 UNIQUE(survey_id, student_id, attempt_number) 一致；
+        # 该唯一索引同时用于按学生查询最近一次作答（ORDER BY attempt_number DESC LIMIT 1）
+        UniqueConstraint(
+            "survey_id", "student_id", "attempt_number",
+            name="survey_responses_survey_id_student_id_attempt_number_key",
+        ),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     survey_id = Column(UUID(as_uuid=True), ForeignKey("surveys.id"), nullable=False, index=True)
@@ -101,6 +140,8 @@ class Answer(Base):
     is_correct = Column(Boolean)
     score = Column(DECIMAL(5, 2), default=0)
     teacher_comment = Column(Text)
+    # AI打分结果（评分细则、优点、建议、评语等）；none_as_null：无结果时存 SQL NULL 而非 JSON 'null'
+    grading_result = Column(JSONB(none_as_null=True))
     auto_graded = Column(Boolean, default=False, nullable=False)
     graded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     graded_at = Column(DateTime)
@@ -0,0 +1,57 @@
+"""
+响应工具模块
+"""
+import asyncio
+from typing import Any
+
+import msgspec
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _dumps(content: Any) -> bytes:
+    """将内容（含 Pydantic 模型、msgspec Struct）序列化为 JSON 字节串"""
+    if isinstance(content, msgspec.Struct):
+        return msgspec.json.encode(content)
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def msgspec_json_schema(type_: Any) -> dict:
+    """
+    生成 msgspec 类型的 JSON Schema（已展开 $ref 引用），
+    可直接用于路由的 responses 参数以生成 OpenAPI 文档
+    """
+    (schema,), components = msgspec.json.schema_components([type_], ref_template="{name}")
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(components[node["$ref"]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    return resolve(schema)
+
+
+class PydanticResponse(ORJSONResponse):
+    """
+    在线程池中完成序列化的 JSON 响应，避免大响应体的编码阻塞事件循环。
+    msgspec Struct 使用 msgspec 编码，其余内容使用 orjson 编码。
+    用法：return await PydanticResponse.create(content=model, status_code=200)
+    """
+
+    @classmethod
+    async def create(cls, content: Any, **kwargs: Any) -> "PydanticResponse":
+        body = await asyncio.to_thread(_dumps, content)
+        return cls(content=body, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        # create() 传入的是已编码好的字节串，直接使用
+        if isinstance(content, bytes):
+            return content
+        return _dumps(content)
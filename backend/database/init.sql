@@ -243,6 +243,8 @@ CREATE TABLE IF NOT EXISTS survey_responses (
     UNIQUE(survey_id, student_id, attempt_number)
 );
 
+-- UNIQUE(survey_id, student_id, attempt_number) 的唯一索引同时支撑
+-- “查询学生最近一次作答”（ORDER BY attempt_number DESC LIMIT 1），无需额外建索引
 CREATE INDEX idx_responses_survey ON survey_responses(survey_id);
 CREATE INDEX idx_responses_student ON survey_responses(student_id);
 CREATE INDEX idx_responses_status ON survey_responses(status);
@@ -261,6 +263,7 @@ CREATE TABLE IF NOT EXISTS answers (
     is_correct BOOLEAN,
     score DECIMAL(5, 2) DEFAULT 0,
     teacher_comment TEXT,
+    grading_result JSONB,
     auto_graded BOOLEAN NOT NULL DEFAULT false,
     graded_by UUID REFERENCES users(id),
     graded_at TIMESTAMP,
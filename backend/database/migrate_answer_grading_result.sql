@@ -0,0 +1,15 @@
+-- 答案表新增 grading_result 列：AI打分结果改为 JSONB 存储
+-- 适用于已执行过旧版 init.sql 的数据库
+-- PostgreSQL 16+（使用 pg_input_is_valid）
+
+ALTER TABLE answers ADD COLUMN IF NOT EXISTS grading_result JSONB;
+
+-- 迁移历史数据：旧版本将AI打分结果以 JSON 文本写入 teacher_comment
+-- 仅处理自动打分的答案，且跳过无法解析为 JSON 的评语，避免单行错误导致整体失败
+UPDATE answers
+SET grading_result = teacher_comment::jsonb,
+    teacher_comment = NULL
+WHERE auto_graded
+  AND grading_result IS NULL
+  AND teacher_comment LIKE '{%'
+  AND pg_input_is_valid(teacher_comment, 'jsonb');